@@ -12,8 +12,15 @@ from pathlib import Path
 import rumps
 import sounddevice as sd
 import tomllib
-
-from .audio import AudioPlayer, list_output_devices
+from PyObjCTools import AppHelper  # type: ignore[import-untyped]
+
+from .audio import (
+    AudioPlayer,
+    device_generation,
+    list_output_devices,
+    rescan_output_devices,
+    watch_output_devices,
+)
 from .generator import (
     DATA_DIR,
     BrainwaveBand,
@@ -179,6 +186,8 @@ class LowHumApp(rumps.App):
 
         self._player = AudioPlayer()
         self._known_device_names: set[str] = set()
+        self._devices_watched = watch_output_devices(self._on_devices_changed)
+        self._device_generation: int | None = None
 
         cfg = _load_config()
         audio_cfg = cfg.get("audio", {})
@@ -253,8 +262,10 @@ class LowHumApp(rumps.App):
         self._login_item.state = _login_item_active()
         self._dock_item.state = self._show_in_dock
 
-        self._device_timer = rumps.Timer(self._check_devices, 2)
-        self._device_timer.start()
+        if not self._devices_watched:
+            # No CoreAudio notifications available — fall back to polling
+            self._device_timer = rumps.Timer(self._check_devices, 2)
+            self._device_timer.start()
 
     # Volume
 
@@ -341,27 +352,37 @@ class LowHumApp(rumps.App):
 
     # Device management
 
-    def _refresh_devices(self) -> None:
-        devices = list_output_devices()
-        self._known_device_names = {name for _, name in devices}
-
-        for key in list(self._device_menu.keys()):
-            del self._device_menu[key]
+    def _cache_generation(self) -> int | None:
+        """Device-list generation, or None when changes can't be observed."""
+        return device_generation() if self._devices_watched else None
 
-        sys_item = rumps.MenuItem(
-            "System Default",
-            callback=lambda _: self._select_device(None),
+    def _refresh_devices(self) -> None:
+        """Sync the Output Device submenu, touching only what changed."""
+        self._device_generation = self._cache_generation()
+        devices = list_output_devices(self._device_generation)
+        names = {name for _, name in devices}
+
+        if "System Default" not in self._device_menu:
+            self._device_menu["System Default"] = rumps.MenuItem(
+                "System Default",
+                callback=lambda _: self._select_device(None),
+            )
+        self._device_menu["System Default"].state = (
+            self._selected_device is None
         )
-        sys_item.state = self._selected_device is None
-        self._device_menu["System Default"] = sys_item
+
+        for name in self._known_device_names - names:
+            del self._device_menu[name]
 
         for idx, name in devices:
-            item = rumps.MenuItem(
-                name,
-                callback=lambda _, d=idx: self._select_device(d),
-            )
+            if name not in self._device_menu:
+                self._device_menu[name] = rumps.MenuItem(name)
+            item = self._device_menu[name]
+            # Indices can shift when devices come and go, so always rebind
+            item.set_callback(lambda _, d=idx: self._select_device(d))
             item.state = self._selected_device == idx
-            self._device_menu[name] = item
+
+        self._known_device_names = names
 
     def _select_device(self, device_id: int | None) -> None:
         was_playing = self._player.playing
@@ -375,20 +396,74 @@ class LowHumApp(rumps.App):
         if was_playing:
             self._play_active()
 
-    def _check_devices(self, _: rumps.Timer) -> None:
+    def _on_devices_changed(self) -> None:
+        # Called on CoreAudio's notification thread; menus are main-only
+        AppHelper.callAfter(self._check_devices)
+
+    def _check_devices(self, _: rumps.Timer | None = None) -> None:
+        generation = self._cache_generation()
+        if generation is None:
+            try:
+                current = {name for _, name in list_output_devices()}
+            except sd.PortAudioError:
+                return
+            if current != self._known_device_names:
+                self._stop_for_device_change()
+                self._refresh_devices()
+            return
+        if generation == self._device_generation:
+            return
+
+        # PortAudio only re-enumerates on restart, which needs every stream
+        # closed.  Playback is paused across it so a change that leaves the
+        # outputs alone (a webcam, an input-only mic) carries on.
+        was_playing = self._player.playing
+        if was_playing:
+            self._player.pause()
+        previous = self._selected_device
         try:
-            current = {name for _, name in list_output_devices()}
+            selected_name = self._device_name(previous)
+            rescan_output_devices()
+            # Indices are reassigned on restart, so follow the name
+            self._selected_device = self._device_index(selected_name)
+            current = {name for _, name in list_output_devices(generation)}
         except sd.PortAudioError:
+            self._stop_for_device_change()
             return
 
+        if self._selected_device != previous:
+            self._persist()
         if current != self._known_device_names:
-            if self._player.playing or self._player.paused:
-                self._player.stop()
-                self._play_pause_item.title = "Play"
-                rumps.notification(
-                    "LowHum", "", "Audio stopped — output device changed."
-                )
-            self._refresh_devices()
+            self._stop_for_device_change()
+        elif self._selected_device != previous:
+            # Same outputs, but a paused player would resume on the old index
+            self._player.stop()
+            self._play_pause_item.title = "Play"
+            if was_playing:
+                self._play_active()
+        elif was_playing:
+            self._player.resume()
+        self._refresh_devices()
+
+    def _device_name(self, device_id: int | None) -> str | None:
+        if device_id is None:
+            return None
+        return dict(list_output_devices(self._device_generation)).get(device_id)
+
+    def _device_index(self, name: str | None) -> int | None:
+        """New index of the output called *name*, or None once it's gone."""
+        for idx, device_name in list_output_devices(self._cache_generation()):
+            if device_name == name:
+                return idx
+        return None
+
+    def _stop_for_device_change(self) -> None:
+        if self._player.playing or self._player.paused:
+            self._player.stop()
+            self._play_pause_item.title = "Play"
+            rumps.notification(
+                "LowHum", "", "Audio stopped — output device changed."
+            )
 
     # Dock toggle
 
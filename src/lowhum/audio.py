@@ -3,15 +3,21 @@
 from __future__ import annotations
 
 import contextlib
+import ctypes
+import functools
+import mmap
 import struct
 import threading
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
 import numpy as np
 import sounddevice as sd
 
-# WAV header parsing (avoids loading the full file into memory)
+_BLOCKSIZE = 2048  # frames per callback
+
+# WAV header parsing
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,40 +28,87 @@ class WavInfo:
     data_offset: int
     data_size: int
 
+    @property
+    def n_frames(self) -> int:
+        return self.data_size // (self.channels * self.bits_per_sample // 8)
+
+
+# Canonical 44-byte PCM header: RIFF + 16-byte fmt chunk + data chunk,
+# which is what the generator writes.
+_CANONICAL_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
 
 def parse_wav_header(file_path: Path) -> WavInfo:
-    """Parse a RIFF/WAV header and return metadata + data offset."""
+    """Parse a RIFF/WAV header and return metadata + data offset.
+
+    The file is memory-mapped and fields are unpacked straight from the
+    mapping, with no stateful reads or seeks.
+    """
     with open(file_path, "rb") as f:
-        if f.read(4) != b"RIFF":
-            raise ValueError("Not a RIFF file")
-        f.read(4)  # file size
-        if f.read(4) != b"WAVE":
-            raise ValueError("Not a WAVE file")
-
-        sample_rate = channels = bits_per_sample = 0
-        data_offset = data_size = 0
-
-        while True:
-            chunk_id = f.read(4)
-            if len(chunk_id) < 4:
-                break
-            (chunk_size,) = struct.unpack("<I", f.read(4))
-
-            if chunk_id == b"fmt ":
-                fmt = f.read(min(chunk_size, 16))
-                _audio_fmt, channels, sample_rate = struct.unpack(
-                    "<HHI", fmt[:8]
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            raise ValueError("Not a RIFF file") from None
+    with mm:
+        if len(mm) >= _CANONICAL_HEADER.size:
+            (
+                riff,
+                _file_size,
+                wave,
+                fmt_id,
+                fmt_size,
+                _audio_fmt,
+                channels,
+                sample_rate,
+                _byte_rate,
+                _block_align,
+                bits_per_sample,
+                data_id,
+                data_size,
+            ) = _CANONICAL_HEADER.unpack_from(mm)
+            if (riff, wave, fmt_id, fmt_size, data_id) == (
+                b"RIFF",
+                b"WAVE",
+                b"fmt ",
+                16,
+                b"data",
+            ):
+                return WavInfo(
+                    sample_rate=sample_rate,
+                    channels=channels,
+                    bits_per_sample=bits_per_sample,
+                    data_offset=_CANONICAL_HEADER.size,
+                    data_size=data_size,
                 )
-                bits_per_sample = struct.unpack("<H", fmt[14:16])[0]
-                remaining = chunk_size - 16
-                if remaining > 0:
-                    f.read(remaining)
-            elif chunk_id == b"data":
-                data_offset = f.tell()
-                data_size = chunk_size
-                break
-            else:
-                f.seek(chunk_size, 1)
+        return _parse_wav_chunks(mm)
+
+
+def _parse_wav_chunks(buf: mmap.mmap) -> WavInfo:
+    """Walk every RIFF chunk — fallback for non-canonical headers."""
+    if buf[0:4] != b"RIFF":
+        raise ValueError("Not a RIFF file")
+    if buf[8:12] != b"WAVE":
+        raise ValueError("Not a WAVE file")
+
+    sample_rate = channels = bits_per_sample = 0
+    data_offset = data_size = 0
+
+    offset = 12
+    while offset + 8 <= len(buf):
+        chunk_id = buf[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", buf, offset + 4)
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            _audio_fmt, channels, sample_rate = struct.unpack_from(
+                "<HHI", buf, body
+            )
+            (bits_per_sample,) = struct.unpack_from("<H", buf, body + 14)
+        elif chunk_id == b"data":
+            data_offset = body
+            data_size = chunk_size
+            break
+        offset = body + chunk_size
 
     return WavInfo(
         sample_rate=sample_rate,
@@ -66,8 +119,125 @@ def parse_wav_header(file_path: Path) -> WavInfo:
     )
 
 
-def list_output_devices() -> list[tuple[int, str]]:
-    """Return ``[(index, name), ...]`` for every output-capable device."""
+@functools.lru_cache(maxsize=2)
+def _load_wav(path: str, mtime_ns: int) -> tuple[WavInfo, np.ndarray]:
+    """Header plus every sample, read-only, shape ``(frames + block, ch)``.
+
+    Reading everything up front means the audio callback never
+    page-faults into the filesystem the way a memmap would.  The first
+    block is mirrored after the end so a read across the loop point is
+    still one contiguous slice.  *mtime_ns* is only part of the cache key,
+    so a regenerated file is reloaded.
+    """
+    info = parse_wav_header(Path(path))
+    data = np.fromfile(
+        path,
+        dtype=np.int16,
+        count=info.n_frames * info.channels,
+        offset=info.data_offset,
+    ).reshape(info.n_frames, info.channels)
+    padded = np.concatenate([data, data[:_BLOCKSIZE]])
+    padded.flags.writeable = False  # shared across playback threads
+    return info, padded
+
+
+# Device enumeration, cached until CoreAudio reports a hardware change
+
+_CORE_AUDIO = "/System/Library/Frameworks/CoreAudio.framework/CoreAudio"
+_SYSTEM_OBJECT = 1  # kAudioObjectSystemObject
+
+
+def _fourcc(code: bytes) -> int:
+    return int.from_bytes(code, "big")
+
+
+class _PropertyAddress(ctypes.Structure):
+    _fields_ = [
+        ("selector", ctypes.c_uint32),
+        ("scope", ctypes.c_uint32),
+        ("element", ctypes.c_uint32),
+    ]
+
+
+_ListenerProc = ctypes.CFUNCTYPE(
+    ctypes.c_int32,
+    ctypes.c_uint32,
+    ctypes.c_uint32,
+    ctypes.POINTER(_PropertyAddress),
+    ctypes.c_void_p,
+)
+
+_device_generation = 0
+_device_listener: object | None = None  # keeps the ctypes callback alive
+_device_change_handler: Callable[[], None] | None = None
+
+
+def device_generation() -> int:
+    """Counter bumped every time CoreAudio reports a device-list change."""
+    return _device_generation
+
+
+def _on_devices_changed(
+    _object_id: int,
+    _n_addresses: int,
+    _addresses: object,
+    _client_data: object,
+) -> int:
+    global _device_generation
+    _device_generation += 1
+    if _device_change_handler is not None:
+        _device_change_handler()
+    return 0
+
+
+def watch_output_devices(on_change: Callable[[], None] | None = None) -> bool:
+    """Register a CoreAudio listener on the hardware device list.
+
+    *on_change* runs on CoreAudio's notification thread, not the main
+    thread.  Returns False when CoreAudio is unavailable, in which case
+    ``device_generation()`` never changes and callers must poll.
+    """
+    global _device_listener, _device_change_handler
+    _device_change_handler = on_change
+    if _device_listener is not None:
+        return True
+    try:
+        core_audio = ctypes.CDLL(_CORE_AUDIO)
+    except OSError:
+        return False
+
+    add_listener = core_audio.AudioObjectAddPropertyListener
+    add_listener.argtypes = [
+        ctypes.c_uint32,
+        ctypes.POINTER(_PropertyAddress),
+        _ListenerProc,
+        ctypes.c_void_p,
+    ]
+    add_listener.restype = ctypes.c_int32
+
+    address = _PropertyAddress(
+        selector=_fourcc(b"dev#"),  # kAudioHardwarePropertyDevices
+        scope=_fourcc(b"glob"),  # kAudioObjectPropertyScopeGlobal
+        element=0,  # kAudioObjectPropertyElementMain
+    )
+    proc = _ListenerProc(_on_devices_changed)
+    if add_listener(_SYSTEM_OBJECT, ctypes.byref(address), proc, None) != 0:
+        return False
+    _device_listener = proc
+    return True
+
+
+def rescan_output_devices() -> None:
+    """Restart PortAudio so it sees devices added or removed since launch.
+
+    PortAudio only enumerates hardware in ``Pa_Initialize``, so querying
+    again returns the stale list.  No stream may be open during the call.
+    """
+    sd._terminate()
+    sd._initialize()
+
+
+def _query_output_devices() -> list[tuple[int, str]]:
     devices = sd.query_devices()
     return [
         (i, d["name"])
@@ -76,19 +246,57 @@ def list_output_devices() -> list[tuple[int, str]]:
     ]
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_output_devices(generation: int) -> tuple[tuple[int, str], ...]:
+    return tuple(_query_output_devices())
+
+
+def list_output_devices(
+    cache_generation: int | None = None,
+) -> list[tuple[int, str]]:
+    """Return ``[(index, name), ...]`` for every output-capable device.
+
+    With *cache_generation* (see ``device_generation()``) the result is
+    reused until the generation changes instead of re-querying PortAudio.
+    """
+    if cache_generation is None:
+        return _query_output_devices()
+    return list(_cached_output_devices(cache_generation))
+
+
 def get_default_output_device() -> int:
     """Index of the current default output device."""
     return sd.default.device[1]  # type: ignore[index]
 
 
+# Thread scheduling for playback (macOS only, no-ops elsewhere)
+
+_LIBSYSTEM = "/usr/lib/libSystem.dylib"
+_QOS_CLASS_USER_INITIATED = 0x19
+
+
+def _set_thread_qos(qos_class: int) -> None:
+    """Set the calling thread's QoS class.
+
+    On Apple Silicon this keeps the thread off the efficiency cores
+    when the machine is busy.
+    """
+    try:
+        libsystem = ctypes.CDLL(_LIBSYSTEM)
+    except OSError:
+        return
+    set_qos = libsystem.pthread_set_qos_class_self_np
+    set_qos.argtypes = [ctypes.c_uint, ctypes.c_int]
+    set_qos(qos_class, 0)
+
+
 class AudioPlayer:
     """Streams a WAV file through sounddevice with device selection."""
 
     def __init__(self) -> None:
+        # The worker thread owns the stream; other threads only signal it
         self._stop_event = threading.Event()
-        self._stream: sd.OutputStream | None = None
-        self._playing = False
-        self._lock = threading.Lock()
+        self._playing = threading.Event()
         self._thread: threading.Thread | None = None
         self._pos = 0
         self._paused_pos: int | None = None
@@ -99,11 +307,11 @@ class AudioPlayer:
 
     @property
     def playing(self) -> bool:
-        return self._playing
+        return self._playing.is_set()
 
     @property
     def paused(self) -> bool:
-        return not self._playing and self._paused_pos is not None
+        return not self._playing.is_set() and self._paused_pos is not None
 
     @property
     def volume(self) -> float:
@@ -126,23 +334,13 @@ class AudioPlayer:
         self._loop = loop
         self._pos = 0
         self._paused_pos = None
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._start(0)
 
     def pause(self) -> None:
         """Freeze playback at the current position."""
         self._stop_event.set()
-        with self._lock:
-            if self._stream is not None:
-                with contextlib.suppress(Exception):
-                    self._stream.abort()
-                self._stream = None
-            self._paused_pos = self._pos
-            self._playing = False
-        if self._thread is not None:
-            self._thread.join(timeout=2)
-            self._thread = None
+        self._join()
+        self._paused_pos = self._pos
 
     def resume(self) -> None:
         """Continue from the paused position."""
@@ -150,56 +348,43 @@ class AudioPlayer:
             return
         start = self._paused_pos
         self._paused_pos = None
-        self._stop_event.clear()
-        self._thread = threading.Thread(
-            target=self._run, args=(start,), daemon=True
-        )
-        self._thread.start()
+        self._start(start)
 
     def stop(self) -> None:
         """Stop playback and reset to the beginning."""
         self._stop_event.set()
-        with self._lock:
-            if self._stream is not None:
-                with contextlib.suppress(Exception):
-                    self._stream.abort()
-                self._stream = None
-            self._playing = False
+        self._join()
         self._paused_pos = None
+
+    def _start(self, start_pos: int) -> None:
+        # A fresh event per session, so a late finished_callback from the
+        # previous stream can't stop this one
+        stop_evt = threading.Event()
+        self._stop_event = stop_evt
+        self._thread = threading.Thread(
+            target=self._run, args=(start_pos, stop_evt), daemon=True
+        )
+        self._thread.start()
+
+    def _join(self) -> None:
         if self._thread is not None:
             self._thread.join(timeout=2)
             self._thread = None
 
-    def _run(self, start_pos: int = 0) -> None:
+    def _run(self, start_pos: int, stop_evt: threading.Event) -> None:
+        _set_thread_qos(_QOS_CLASS_USER_INITIATED)
         file_path = self._file_path
         assert file_path is not None  # set by play() before _run
         device = self._device
         loop = self._loop
 
-        info = parse_wav_header(file_path)
-        n_frames = info.data_size // (info.channels * info.bits_per_sample // 8)
-
-        if info.channels == 1:
-            data = np.memmap(
-                file_path,
-                dtype=np.int16,
-                mode="r",
-                offset=info.data_offset,
-                shape=(n_frames,),
-            )
-        else:
-            data = np.memmap(
-                file_path,
-                dtype=np.int16,
-                mode="r",
-                offset=info.data_offset,
-                shape=(n_frames, info.channels),
-            )
+        info, padded = _load_wav(str(file_path), file_path.stat().st_mtime_ns)
+        n_frames = info.n_frames
 
         pos = [start_pos]
-        stop_evt = self._stop_event
-        mono = info.channels == 1
 
+        # The callback thread is left alone: on macOS it's CoreAudio's HAL
+        # IO thread, already under a time-constraint policy no QoS outranks
         def _callback(
             outdata: np.ndarray,
             frames: int,
@@ -210,36 +395,14 @@ class AudioPlayer:
             end = current + frames
             should_stop = False
 
-            if mono:
-                if end <= n_frames:
-                    outdata[:, 0] = data[current:end]
-                    pos[0] = end
-                elif loop:
-                    first = n_frames - current
-                    outdata[:first, 0] = data[current:]
-                    remaining = frames - first
-                    outdata[first:, 0] = data[:remaining]
-                    pos[0] = remaining
-                else:
-                    first = n_frames - current
-                    outdata[:first, 0] = data[current:]
-                    outdata[first:] = 0
-                    should_stop = True
+            outdata[:] = padded[current:end]
+            if end <= n_frames:
+                pos[0] = end
+            elif loop:
+                pos[0] = end - n_frames
             else:
-                if end <= n_frames:
-                    outdata[:] = data[current:end]
-                    pos[0] = end
-                elif loop:
-                    first = n_frames - current
-                    outdata[:first] = data[current:]
-                    remaining = frames - first
-                    outdata[first:] = data[:remaining]
-                    pos[0] = remaining
-                else:
-                    first = n_frames - current
-                    outdata[:first] = data[current:]
-                    outdata[first:] = 0
-                    should_stop = True
+                outdata[n_frames - current :] = 0
+                should_stop = True
 
             vol = self._volume
             if vol != 1.0:
@@ -257,25 +420,23 @@ class AudioPlayer:
                 channels=info.channels,
                 dtype="int16",
                 device=device,
-                blocksize=2048,
+                blocksize=_BLOCKSIZE,
                 callback=_callback,
+                # Wakes the wait below when playback ends on its own
+                finished_callback=stop_evt.set,
             )
-            with self._lock:
-                self._stream = stream
-                self._playing = True
+        except sd.PortAudioError as exc:
+            print(f"Audio error: {exc}")
+            return
 
+        try:
             stream.start()
-            while stream.active and not stop_evt.is_set():
-                sd.sleep(100)
+            self._playing.set()
+            stop_evt.wait()
         except sd.PortAudioError as exc:
             print(f"Audio error: {exc}")
         finally:
-            with self._lock:
-                if self._stream is not None:
-                    try:
-                        self._stream.stop()
-                        self._stream.close()
-                    except Exception:
-                        pass
-                    self._stream = None
-                self._playing = False
+            self._playing.clear()
+            # Closing an active stream discards pending buffers (= abort)
+            with contextlib.suppress(Exception):
+                stream.close()
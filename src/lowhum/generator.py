@@ -1,17 +1,31 @@
 """Noise and binaural beat generator — cached WAV files for playback."""
 
 import math
+import os
+import wave
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from itertools import islice
 from pathlib import Path
 
 import numpy as np
-from scipy.io.wavfile import write as wav_write
-from scipy.signal import butter, sosfilt
+from scipy.signal import butter, sosfilt, unit_impulse
 
 SAMPLE_RATE = 44_100
 DURATION = 600  # seconds (10 minutes)
 DATA_DIR = Path.home() / ".lowhum"
 
+# Leaky integrator pole for brown noise, placed at the 1 Hz highpass
+# corner so the -6 dB/oct slope is kept across the whole audible band.
+_BROWN_POLE = math.exp(-2 * math.pi * 1.0 / SAMPLE_RATE)
+
+# 1 s equal-gain crossfade between chunks, shared by every generated file
+_XFADE = SAMPLE_RATE
+_FADE_OUT = np.linspace(1, 0, _XFADE, dtype=np.float32)
+_FADE_IN = 1.0 - _FADE_OUT
+
 
 class NoiseColor(str, Enum):
     BROWN = "brown"
@@ -23,36 +37,128 @@ def audio_file(color: NoiseColor) -> Path:
     return DATA_DIR / f"{color.value}_noise.wav"
 
 
-def _raw_noise(color: NoiseColor, n: int) -> np.ndarray:
-    white = np.random.randn(n)
-    if color == NoiseColor.WHITE:
-        return white
-    elif color == NoiseColor.PINK:
-        f = np.fft.rfftfreq(n)
+def _raw_noise(
+    color: NoiseColor, n: int, rng: np.random.Generator
+) -> np.ndarray:
+    white = rng.standard_normal(n, dtype=np.float32)
+    if color == NoiseColor.PINK:
+        f = np.fft.rfftfreq(n).astype(np.float32)
         f[0] = 1.0  # avoid divide-by-zero at DC
         return np.fft.irfft(np.fft.rfft(white) / np.sqrt(f), n=n)
-    else:  # BROWN
-        return np.cumsum(white)
-
-
-def _crossfade(chunks: list[np.ndarray]) -> np.ndarray:
-    """Overlap-add crossfade across chunk boundaries (1 s)."""
-    if len(chunks) == 1:
-        return chunks[0]
-    xfade = SAMPLE_RATE
-    fade_out = np.linspace(1, 0, xfade)
-    fade_in = np.linspace(0, 1, xfade)
-    if chunks[0].ndim == 2:
-        fade_out = fade_out[:, np.newaxis]
-        fade_in = fade_in[:, np.newaxis]
-    parts: list[np.ndarray] = [chunks[0][:-xfade]]
-    for i in range(1, len(chunks)):
-        blend = chunks[i - 1][-xfade:] * fade_out + chunks[i][:xfade] * fade_in
-        parts.append(blend)
-        last = i == len(chunks) - 1
-        tail = chunks[i][xfade:] if last else chunks[i][xfade:-xfade]
-        parts.append(tail)
-    return np.concatenate(parts)
+    # Brown is integrated by the first section of its SOS cascade
+    return white
+
+
+def _noise_sos(color: NoiseColor) -> np.ndarray:
+    """Stacked SOS cascade for *color*, applied with a single ``sosfilt``.
+
+    Brown: one-pole leaky integrator, Butterworth HP 1 Hz + LP 500 Hz.
+    Every color ends with the 20 Hz sub-bass highpass.  Coefficients are
+    float32 so ``sosfilt`` stays in single precision.
+    """
+    sub_sos = butter(1, 20, btype="high", fs=SAMPLE_RATE, output="sos")
+    if color != NoiseColor.BROWN:
+        return sub_sos.astype(np.float32)
+    leaky_sos = np.array([[1.0, 0.0, 0.0, 1.0, -_BROWN_POLE, 0.0]])
+    hp_sos = butter(2, 1.0, btype="high", fs=SAMPLE_RATE, output="sos")
+    lp_sos = butter(2, 500, btype="low", fs=SAMPLE_RATE, output="sos")
+    return np.vstack([leaky_sos, hp_sos, lp_sos, sub_sos]).astype(np.float32)
+
+
+def _steady_state_rms(sos: np.ndarray) -> float:
+    """Output RMS of *sos* for unit-variance white input.
+
+    The cascade is linear, so this is the L2 norm of its impulse
+    response (10 s is far past the decay of the 1 Hz poles).
+    """
+    h = sosfilt(sos.astype(np.float64), unit_impulse(10 * SAMPLE_RATE))
+    return float(np.sqrt(np.sum(h**2)))
+
+
+def _noise_chunks(
+    color: NoiseColor, n_chunks: int, n: int
+) -> Iterator[np.ndarray]:
+    """Yield *n_chunks* filtered chunks of *n* samples at RMS 0.3, in order.
+
+    Chunks are independent, so they run on a thread pool — the RNG,
+    FFT and ``sosfilt`` all release the GIL, and threads avoid pickling
+    hundreds of MB between processes.  Each chunk draws from its own
+    spawned seed, so no generator state is shared.  At most one chunk
+    per worker is in flight, so memory stays bounded however many chunks
+    the caller asks for.
+    """
+    sos = _noise_sos(color)
+    # Pink is shaped per chunk in the FFT domain, so its level is measured
+    rms = None if color == NoiseColor.PINK else _steady_state_rms(sos)
+
+    def make_chunk(seed: np.random.SeedSequence) -> np.ndarray:
+        chunk = sosfilt(sos, _raw_noise(color, n, np.random.default_rng(seed)))
+        chunk *= 0.3 / (rms or np.sqrt(np.mean(chunk**2)))
+        return chunk
+
+    seeds = iter(np.random.SeedSequence().spawn(n_chunks))
+    workers = min(n_chunks, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(
+            pool.submit(make_chunk, seed) for seed in islice(seeds, workers)
+        )
+        while pending:
+            chunk = pending.popleft().result()
+            if (seed := next(seeds, None)) is not None:
+                pending.append(pool.submit(make_chunk, seed))
+            yield chunk
+
+
+def _write_crossfaded(
+    output_path: Path, chunks: Iterable[np.ndarray], n_frames: int
+) -> None:
+    """Stream *chunks* to a 16-bit WAV, crossfading 1 s at each boundary.
+
+    Each chunk is scaled and written as soon as it arrives; only its last
+    second is held back to blend with the next one.  Output stops after
+    *n_frames* frames.  Frames go to a sibling ``.part`` file that only
+    replaces *output_path* once complete, since callers treat an existing
+    path as a finished file.
+    """
+    part_path = output_path.with_suffix(".wav.part")
+    try:
+        _write_wav_frames(part_path, chunks, n_frames)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    os.replace(part_path, output_path)
+
+
+def _write_wav_frames(
+    path: Path, chunks: Iterable[np.ndarray], n_frames: int
+) -> None:
+    with wave.open(str(path), "wb") as w:
+        remaining = n_frames
+
+        def write(frames: np.ndarray) -> None:
+            nonlocal remaining
+            frames = frames[:remaining]
+            w.writeframesraw((frames * 32_767).astype("<i2").tobytes())
+            remaining -= len(frames)
+
+        tail: np.ndarray | None = None
+        for chunk in chunks:
+            if tail is None:
+                w.setnchannels(1 if chunk.ndim == 1 else chunk.shape[1])
+                w.setsampwidth(2)
+                w.setframerate(SAMPLE_RATE)
+                fade_out, fade_in = _FADE_OUT, _FADE_IN
+                if chunk.ndim == 2:
+                    fade_out = fade_out[:, np.newaxis]
+                    fade_in = fade_in[:, np.newaxis]
+                body = chunk
+            else:
+                write(tail * fade_out + chunk[:_XFADE] * fade_in)
+                body = chunk[_XFADE:]
+            write(body[:-_XFADE])
+            tail = body[-_XFADE:].copy()  # lets the rest of the chunk go
+        if tail is not None:
+            write(tail)
 
 
 def generate_noise(
@@ -62,7 +168,8 @@ def generate_noise(
 ) -> Path:
     """Generate noise of the requested color and write as WAV.
 
-    Brown: cumsum white noise, Butterworth bandpass (1-500 Hz) + HP 20 Hz.
+    Brown: leaky-integrated white noise, Butterworth bandpass (1-500 Hz)
+    + HP 20 Hz.
     Pink: 1/f spectral shaping via FFT, HP 20 Hz.
     White: gaussian noise, HP 20 Hz.
     """
@@ -73,26 +180,12 @@ def generate_noise(
     chunk_samples = SAMPLE_RATE * 300  # process in 5-min chunks
     n_chunks = max(1, math.ceil(duration * SAMPLE_RATE / chunk_samples))
 
-    sub_sos = butter(1, 20, btype="high", fs=SAMPLE_RATE, output="sos")
-    if color == NoiseColor.BROWN:
-        hp_sos = butter(2, 1.0, btype="high", fs=SAMPLE_RATE, output="sos")
-        lp_sos = butter(2, 500, btype="low", fs=SAMPLE_RATE, output="sos")
-
-    chunks: list[np.ndarray] = []
-    for _ in range(n_chunks):
-        chunk = _raw_noise(color, chunk_samples)
-        if color == NoiseColor.BROWN:
-            chunk = sosfilt(hp_sos, chunk)
-            chunk = sosfilt(lp_sos, chunk)
-        chunk = sosfilt(sub_sos, chunk)
-        rms = np.sqrt(np.mean(chunk**2))
-        chunk = chunk * (0.3 / rms)
-        chunk = np.clip(chunk, -1.0, 1.0)
-        chunks.append(chunk)
-
-    final = _crossfade(chunks)[: duration * SAMPLE_RATE]
-    audio_data = (final * 32_767).astype(np.int16)
-    wav_write(str(output_path), SAMPLE_RATE, audio_data)
+    chunks = (
+        np.clip(chunk, -1.0, 1.0, out=chunk)
+        for chunk in _noise_chunks(color, n_chunks, chunk_samples)
+    )
+
+    _write_crossfaded(output_path, chunks, duration * SAMPLE_RATE)
     return output_path
 
 
@@ -180,52 +273,51 @@ def generate_binaural(
     chunk_samples = SAMPLE_RATE * chunk_seconds
     n_chunks = max(1, math.ceil(duration * SAMPLE_RATE / chunk_samples))
 
-    # Filters for the noise bed (same as generate_noise)
-    sub_sos = butter(1, 20, btype="high", fs=SAMPLE_RATE, output="sos")
-    if noise == NoiseColor.BROWN:
-        hp_sos = butter(2, 1.0, btype="high", fs=SAMPLE_RATE, output="sos")
-        lp_sos = butter(2, 500, btype="low", fs=SAMPLE_RATE, output="sos")
+    # Noise beds (mono, duplicated to both channels), same as generate_noise
+    beds = _noise_chunks(noise, n_chunks, chunk_samples)
 
     # Each chunk is (n, 2) — left and right channels
-    chunks: list[np.ndarray] = []
-    sample_offset = 0
-
-    for _ in range(n_chunks):
-        # Noise bed (mono, duplicated to both channels)
-        bed = _raw_noise(noise, chunk_samples)
-        if noise == NoiseColor.BROWN:
-            bed = sosfilt(hp_sos, bed)
-            bed = sosfilt(lp_sos, bed)
-        bed = sosfilt(sub_sos, bed)
-        rms = np.sqrt(np.mean(bed**2))
-        bed *= 0.3 / rms
-
-        # Binaural tones — continuous phase across chunks
-        t = (np.arange(chunk_samples) + sample_offset) / SAMPLE_RATE
-        left_tone = np.sin(2 * np.pi * left_hz * t) * beat_volume
-        right_tone = np.sin(2 * np.pi * right_hz * t) * beat_volume
-        sample_offset += chunk_samples
-
-        stereo = np.column_stack(
-            [
-                bed + left_tone,
-                bed + right_tone,
-            ]
-        )
+    chunks = (
+        _binaural_chunk(bed, i * chunk_samples, left_hz, right_hz, beat_volume)
+        for i, bed in enumerate(beds)
+    )
 
-        # Per-channel RMS normalize to 0.3
-        for ch in range(2):
-            ch_rms = np.sqrt(np.mean(stereo[:, ch] ** 2))
-            if ch_rms > 0:
-                stereo[:, ch] *= 0.3 / ch_rms
+    _write_crossfaded(output_path, chunks, duration * SAMPLE_RATE)
+    return output_path
 
-        stereo = np.clip(stereo, -1.0, 1.0)
-        chunks.append(stereo)
 
-    final = _crossfade(chunks)[: duration * SAMPLE_RATE]
-    audio_data = (final * 32_767).astype(np.int16)
-    wav_write(str(output_path), SAMPLE_RATE, audio_data)
-    return output_path
+def _binaural_chunk(
+    bed: np.ndarray,
+    sample_offset: int,
+    left_hz: float,
+    right_hz: float,
+    beat_volume: float,
+) -> np.ndarray:
+    """Layer the two carrier tones over *bed* as an ``(n, 2)`` chunk."""
+    # Binaural tones — continuous phase across chunks
+    t = (np.arange(len(bed)) + sample_offset) / SAMPLE_RATE
+    # Phase is computed in float64 — float32 drifts over minutes
+    left_tone = (np.sin(2 * np.pi * left_hz * t) * beat_volume).astype(
+        np.float32
+    )
+    right_tone = (np.sin(2 * np.pi * right_hz * t) * beat_volume).astype(
+        np.float32
+    )
+
+    stereo = np.column_stack(
+        [
+            bed + left_tone,
+            bed + right_tone,
+        ]
+    )
+
+    # Per-channel RMS normalize to 0.3
+    for ch in range(2):
+        ch_rms = np.sqrt(np.mean(stereo[:, ch] ** 2))
+        if ch_rms > 0:
+            stereo[:, ch] *= 0.3 / ch_rms
+
+    return np.clip(stereo, -1.0, 1.0, out=stereo)
 
 
 def ensure_binaural(
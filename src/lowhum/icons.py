@@ -15,6 +15,8 @@ _TEMPLATE_ICON = _DATA_DIR / "icon_template.png"
 # Menu bar icon: 22 pt = 44 px @2x retina
 _ICON_SIZE = 44
 
+_cached_icon: Path | None = None  # set once the icon is known to exist
+
 
 def ensure_template_icon() -> Path:
     """Return path to a filled template icon, creating it if needed.
@@ -23,7 +25,11 @@ def ensure_template_icon() -> Path:
     pixel to solid black, resizes to 44x44, and saves.  macOS renders
     template icons automatically in dark/light mode.
     """
+    global _cached_icon
+    if _cached_icon is not None:
+        return _cached_icon
     if _TEMPLATE_ICON.exists():
+        _cached_icon = _TEMPLATE_ICON
         return _TEMPLATE_ICON
 
     _DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -43,9 +49,10 @@ def ensure_template_icon() -> Path:
     pixels = np.array(img)
 
     # Threshold: any pixel with alpha > 30 → solid black; else transparent
-    mask = pixels[:, :, 3] > 30
-    pixels[mask] = [0, 0, 0, 255]
-    pixels[~mask] = [0, 0, 0, 0]
+    alpha = (pixels[:, :, 3] > 30).astype(np.uint8) * 255
+    pixels[:, :, :3] = 0
+    pixels[:, :, 3] = alpha
 
     Image.fromarray(pixels).save(_TEMPLATE_ICON)
+    _cached_icon = _TEMPLATE_ICON
     return _TEMPLATE_ICON